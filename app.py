@@ -1,20 +1,70 @@
 
-import math
-from dataclasses import dataclass, asdict
-
+import altair as alt
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
 import streamlit as st
 
 from bbb_model import (
     BBBInputParams,
     compute_bbb_probability,
-    size_transfer_function,
-    lipophilicity_transfer_function,
-    charge_transfer_function,
-    integrity_transfer_function,
+    size_transfer_vec,
+)
+
+# (component key, display label) for the factor contributions table
+FACTOR_ROWS = (
+    ("size_score", "Size window"),
+    ("affinity_score", "ApoE3 binding affinity"),
+    ("lipophilicity_score", "Lipophilicity"),
+    ("charge_score", "Charge suitability"),
+    ("integrity_score", "BBB tightness"),
+    ("inflammation_score", "Inflammation"),
+    ("dose_score", "Dose (relative)"),
+    ("carrier_score", "ApoE3 expression"),
 )
+FACTOR_KEYS = [key for key, _ in FACTOR_ROWS]
+FACTOR_LABELS = [label for _, label in FACTOR_ROWS]
+
+
+@st.cache_data(max_entries=128)
+def _cached_compute(params: BBBInputParams):
+    """Memoize the model on the (frozen, hashable) parameter set across reruns."""
+    return compute_bbb_probability(params)
+
+
+@st.cache_data
+def _size_curve(n: int = 200):
+    """The size window curve does not depend on any input, so build it once."""
+    size_range = np.linspace(1, 500, n)
+    size_scores = size_transfer_vec(size_range)
+    return size_range, size_scores
+
+
+def _size_chart(size_nm: float) -> alt.LayerChart:
+    """Size window curve with a dashed marker at the selected size."""
+    # pandas is only needed here, so keep it out of the app's import time
+    import pandas as pd
+
+    size_range, size_scores = _size_curve()
+    curve_df = pd.DataFrame({"size_nm": size_range, "score": size_scores})
+    marker_df = pd.DataFrame({"size_nm": [size_nm], "label": [f"{size_nm:.0f} nm"]})
+
+    curve = alt.Chart(curve_df).mark_line().encode(
+        x=alt.X("size_nm:Q", title="Particle size (nm)"),
+        y=alt.Y("score:Q", title="Size suitability score (0–1)"),
+    )
+    marker = alt.Chart(marker_df).mark_rule(strokeDash=[4, 4]).encode(x="size_nm:Q")
+    marker_label = alt.Chart(marker_df).mark_text(
+        angle=270, align="left", dx=4, dy=-4, y="height"
+    ).encode(x="size_nm:Q", text="label:N")
+
+    return (curve + marker + marker_label).properties(
+        title="Conceptual size window for ApoE3-mediated BBB crossing"
+    )
+
+
+def _sensitivity_block(size_nm: float) -> None:
+    """Size sensitivity plot; redrawn on the full rerun of each form submit."""
+    st.markdown("#### Sensitivity to particle size")
+    st.altair_chart(_size_chart(size_nm), use_container_width=True)
 
 
 st.set_page_config(
@@ -36,7 +86,7 @@ All equations and parameters are heuristic and for **exploration only**, not for
 
 st.sidebar.header("Particle & Environment Parameters")
 
-with st.sidebar:
+with st.sidebar.form("params"):
     st.markdown("### Nano-plastic properties")
     size_nm = st.slider(
         "Hydrodynamic diameter (nm)",
@@ -114,20 +164,23 @@ with st.sidebar:
     )
 
     st.markdown("---")
-    st.markdown("### Model tuning (advanced)")
-    st.caption(
-        "Weights below change how strongly each factor influences the probability. "
-        "They are dimensionless and purely heuristic."
-    )
+    with st.expander("Model tuning (advanced)", expanded=False):
+        st.caption(
+            "Weights below change how strongly each factor influences the probability. "
+            "They are dimensionless and purely heuristic."
+        )
 
-    w_size = st.slider("Weight: size window", -4.0, 4.0, 2.0, 0.1)
-    w_aff = st.slider("Weight: ApoE3 affinity", -4.0, 4.0, 2.5, 0.1)
-    w_lip = st.slider("Weight: lipophilicity", -4.0, 4.0, 1.0, 0.1)
-    w_charge = st.slider("Weight: charge", -4.0, 4.0, 1.0, 0.1)
-    w_int = st.slider("Weight: BBB integrity", -4.0, 4.0, -2.0, 0.1)
-    w_inf = st.slider("Weight: inflammation", -4.0, 4.0, 0.5, 0.1)
-    w_dose = st.slider("Weight: dose", -4.0, 4.0, 1.5, 0.1)
-    w_carrier = st.slider("Weight: ApoE3 expression", -4.0, 4.0, 2.0, 0.1)
+        w_size = st.number_input("Weight: size window", -4.0, 4.0, 2.0, 0.1)
+        w_aff = st.number_input("Weight: ApoE3 affinity", -4.0, 4.0, 2.5, 0.1)
+        w_lip = st.number_input("Weight: lipophilicity", -4.0, 4.0, 1.0, 0.1)
+        w_charge = st.number_input("Weight: charge", -4.0, 4.0, 1.0, 0.1)
+        w_int = st.number_input("Weight: BBB integrity", -4.0, 4.0, -2.0, 0.1)
+        w_inf = st.number_input("Weight: inflammation", -4.0, 4.0, 0.5, 0.1)
+        w_dose = st.number_input("Weight: dose", -4.0, 4.0, 1.5, 0.1)
+        w_carrier = st.number_input("Weight: ApoE3 expression", -4.0, 4.0, 2.0, 0.1)
+
+    # Widgets inside the form only trigger a rerun once this is pressed.
+    st.form_submit_button("Recompute")
 
 params = BBBInputParams(
     size_nm=size_nm,
@@ -148,7 +201,7 @@ params = BBBInputParams(
     w_carrier=w_carrier,
 )
 
-prob, components = compute_bbb_probability(params)
+prob, components = _cached_compute(params)
 
 col_main, col_details = st.columns([1.2, 1.0])
 
@@ -165,47 +218,14 @@ with col_main:
     )
 
     st.markdown("#### Factor contributions (0–1 scale)")
-    df = pd.DataFrame(
+    st.table(
         {
-            "Factor": [
-                "Size window",
-                "ApoE3 binding affinity",
-                "Lipophilicity",
-                "Charge suitability",
-                "BBB tightness",
-                "Inflammation",
-                "Dose (relative)",
-                "ApoE3 expression",
-            ],
-            "Score (0–1)": [
-                components["size_score"],
-                components["affinity_score"],
-                components["lipophilicity_score"],
-                components["charge_score"],
-                components["integrity_score"],
-                components["inflammation_score"],
-                components["dose_score"],
-                components["carrier_score"],
-            ],
+            "Factor": FACTOR_LABELS,
+            "Score (0–1)": [f"{components[key]:.3f}" for key in FACTOR_KEYS],
         }
     )
 
-    st.dataframe(df, hide_index=True, use_container_width=True)
-
-    st.markdown("#### Sensitivity to particle size")
-
-    size_range = np.linspace(1, 500, 200)
-    size_scores = [size_transfer_function(s) for s in size_range]
-
-    fig, ax = plt.subplots()
-    ax.plot(size_range, size_scores)
-    ax.set_xlabel("Particle size (nm)")
-    ax.set_ylabel("Size suitability score (0–1)")
-    ax.set_title("Conceptual size window for ApoE3-mediated BBB crossing")
-
-    ax.axvline(size_nm, linestyle="--")
-    ax.text(size_nm, 0.05, f"{size_nm:.0f} nm", rotation=90, va="bottom")
-    st.pyplot(fig)
+    _sensitivity_block(size_nm)
 
 with col_details:
     st.subheader("Model details")
@@ -1,10 +1,23 @@
 
 import math
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, Tuple
 
+import numpy as np
 
-@dataclass
+try:
+    from numba import njit, types
+except ImportError:  # numba is optional; fall back to plain Python functions
+    types = None
+
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+@dataclass(frozen=True, slots=True)
 class BBBInputParams:
     # core inputs
     size_nm: float
@@ -26,12 +39,40 @@ class BBBInputParams:
     w_dose: float
     w_carrier: float
 
+    # the eight weights above as one read-only array, in `_SCORE_KEYS` order
+    weights: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        weights = np.array(
+            [
+                self.w_size,
+                self.w_aff,
+                self.w_lip,
+                self.w_charge,
+                self.w_int,
+                self.w_inf,
+                self.w_dose,
+                self.w_carrier,
+            ],
+            dtype=np.float64,
+        )
+        # read-only, since it is left out of eq/hash but feeds the kernel
+        weights.flags.writeable = False
+        object.__setattr__(self, "weights", weights)
 
+
+@njit("float64(float64, float64, float64)", cache=True)
 def _gaussian(x: float, mu: float, sigma: float) -> float:
     """Simple Gaussian transfer function, output in [0, 1]."""
     return math.exp(-0.5 * ((x - mu) / sigma) ** 2)
 
 
+def _gaussian_vec(x: np.ndarray, mu: float, sigma: float) -> np.ndarray:
+    """Array version of `_gaussian`."""
+    return np.exp(-0.5 * ((x - mu) / sigma) ** 2)
+
+
+@njit("float64(float64)", cache=True)
 def size_transfer_function(size_nm: float) -> float:
     """
     Heuristic size suitability for ApoE3-mediated BBB crossing.
@@ -47,6 +88,17 @@ def size_transfer_function(size_nm: float) -> float:
     return max(0.0, min(1.0, _gaussian(x, mu, sigma)))
 
 
+def size_transfer_vec(size_nm: np.ndarray) -> np.ndarray:
+    """
+    Vectorized `size_transfer_function` for plotting / sweeps over many sizes.
+    """
+    x = np.log10(np.maximum(size_nm, 0.1))
+    mu = math.log10(50.0)
+    sigma = 0.25
+    return np.clip(_gaussian_vec(x, mu, sigma), 0.0, 1.0)
+
+
+@njit("float64(float64)", cache=True)
 def lipophilicity_transfer_function(logP: float) -> float:
     """
     Heuristic: peak lipophilicity around logP 2–4, with soft drop-off.
@@ -56,6 +108,12 @@ def lipophilicity_transfer_function(logP: float) -> float:
     return max(0.0, min(1.0, score))
 
 
+def lipophilicity_transfer_vec(logP: np.ndarray) -> np.ndarray:
+    """Vectorized `lipophilicity_transfer_function`."""
+    return np.clip(_gaussian_vec(logP, 3.0, 1.0), 0.0, 1.0)
+
+
+@njit("float64(float64)", cache=True)
 def charge_transfer_function(zeta_mV: float) -> float:
     """
     Heuristic: near-neutral charge is favored.
@@ -66,6 +124,13 @@ def charge_transfer_function(zeta_mV: float) -> float:
     return max(0.0, min(1.0, val))
 
 
+def charge_transfer_vec(zeta_mV: np.ndarray) -> np.ndarray:
+    """Vectorized `charge_transfer_function`."""
+    max_abs = 40.0
+    return np.clip(1.0 - np.minimum(np.abs(zeta_mV), max_abs) / max_abs, 0.0, 1.0)
+
+
+@njit("float64(float64)", cache=True)
 def integrity_transfer_function(bbb_tightness: float) -> float:
     """
     Convert tightness (0–1) to a permeability-like score.
@@ -75,6 +140,12 @@ def integrity_transfer_function(bbb_tightness: float) -> float:
     return 1.0 - tight
 
 
+def integrity_transfer_vec(bbb_tightness: np.ndarray) -> np.ndarray:
+    """Vectorized `integrity_transfer_function`."""
+    return 1.0 - np.clip(bbb_tightness, 0.0, 1.0)
+
+
+@njit("float64(float64)", cache=True)
 def dose_transfer_function(dose_relative: float) -> float:
     """
     Simple saturating function: higher dose → asymptotically approach 1.
@@ -85,6 +156,14 @@ def dose_transfer_function(dose_relative: float) -> float:
     return max(0.0, min(1.0, dose / (K + dose)))
 
 
+def dose_transfer_vec(dose_relative: np.ndarray) -> np.ndarray:
+    """Vectorized `dose_transfer_function`."""
+    dose = np.maximum(dose_relative, 0.0)
+    K = 2.0
+    return np.clip(dose / (K + dose), 0.0, 1.0)
+
+
+@njit("float64(float64)", cache=True)
 def inflammation_transfer_function(inflammation: float) -> float:
     """
     Assume higher inflammation → higher permeability (up to a cap).
@@ -94,45 +173,238 @@ def inflammation_transfer_function(inflammation: float) -> float:
     return inflam ** 0.7
 
 
+def inflammation_transfer_vec(inflammation: np.ndarray) -> np.ndarray:
+    """Vectorized `inflammation_transfer_function`."""
+    return np.clip(inflammation, 0.0, 1.0) ** 0.7
+
+
+@njit("float64(float64)", cache=True)
 def logistic(z: float) -> float:
     return 1.0 / (1.0 + math.exp(-z))
 
 
+@njit("float64(float64)", cache=True)
+def logistic_fast(z: float) -> float:
+    """
+    Same as `logistic`, via the identity 1 / (1 + e^-z) = (1 + tanh(z / 2)) / 2.
+
+    A single tanh is cheaper than exp plus a division and cannot overflow for
+    large |z|.
+    """
+    return 0.5 * (1.0 + math.tanh(0.5 * z))
+
+
+def logistic_vec(z: np.ndarray) -> np.ndarray:
+    return 0.5 * (1.0 + np.tanh(0.5 * z))
+
+
+# Lookup tables over the slider grids used by the app. Each transfer function
+# is only ever evaluated at a few hundred distinct inputs, so they are
+# tabulated once at import; off-grid inputs fall back to the exact function.
+# Reads go through float() so the plain-Python fallback returns Python floats
+# rather than np.float64, as it does under numba.
+def _build_lut(func, lo: float, step: float, n: int) -> np.ndarray:
+    return np.array([func(lo + i * step) for i in range(n)])
+
+
+_SIZE_LUT = _build_lut(size_transfer_function, 1.0, 1.0, 500)  # 1–500 nm
+_LOGP_LUT = _build_lut(lipophilicity_transfer_function, -2.0, 0.1, 81)  # -2–6
+_ZETA_LUT = _build_lut(charge_transfer_function, -40.0, 1.0, 81)  # -40–40 mV
+_DOSE_LUT = _build_lut(dose_transfer_function, 0.0, 0.1, 101)  # 0–10
+
+
+@njit("int64(float64, float64, float64, int64)", cache=True)
+def _lut_index(x: float, lo: float, step: float, n: int) -> int:
+    """Index of `x` on the grid lo + i * step, or -1 if it is not a grid point."""
+    # range check first: this also rejects nan/inf before the int conversion
+    if not (lo <= x <= lo + (n - 1) * step):
+        return -1
+    i = int(round((x - lo) / step))
+    if abs(lo + i * step - x) > 1e-9:
+        return -1
+    return i
+
+
+@njit("float64(float64)", cache=True)
+def size_transfer_function_fast(size_nm: float) -> float:
+    i = _lut_index(size_nm, 1.0, 1.0, 500)
+    return float(_SIZE_LUT[i]) if i >= 0 else size_transfer_function(size_nm)
+
+
+@njit("float64(float64)", cache=True)
+def lipophilicity_transfer_function_fast(logP: float) -> float:
+    i = _lut_index(logP, -2.0, 0.1, 81)
+    return float(_LOGP_LUT[i]) if i >= 0 else lipophilicity_transfer_function(logP)
+
+
+@njit("float64(float64)", cache=True)
+def charge_transfer_function_fast(zeta_mV: float) -> float:
+    i = _lut_index(zeta_mV, -40.0, 1.0, 81)
+    return float(_ZETA_LUT[i]) if i >= 0 else charge_transfer_function(zeta_mV)
+
+
+@njit("float64(float64)", cache=True)
+def dose_transfer_function_fast(dose_relative: float) -> float:
+    i = _lut_index(dose_relative, 0.0, 0.1, 101)
+    return float(_DOSE_LUT[i]) if i >= 0 else dose_transfer_function(dose_relative)
+
+
+# Order of the factor scores returned by `_compute_bbb_probability_nb`.
+_SCORE_KEYS = (
+    "size_score",
+    "affinity_score",
+    "lipophilicity_score",
+    "charge_score",
+    "integrity_score",
+    "inflammation_score",
+    "dose_score",
+    "carrier_score",
+)
+
+
+# Kernel signature: 8 scalar inputs plus the read-only weights array ->
+# (8 scores, Z). String signatures cannot express a read-only array.
+if types is not None:
+    _KERNEL_SIGNATURE = types.UniTuple(types.float64, 9)(
+        *[types.float64] * 8, types.Array(types.float64, 1, "C", readonly=True)
+    )
+else:
+    _KERNEL_SIGNATURE = None
+
+
+@njit(_KERNEL_SIGNATURE, cache=True)
+def _compute_bbb_probability_nb(
+    size_nm: float,
+    apoe3_affinity: float,
+    logP: float,
+    zeta_mV: float,
+    dose_relative: float,
+    apoe3_expression: float,
+    bbb_tightness: float,
+    inflammation: float,
+    weights: np.ndarray,
+) -> Tuple[float, ...]:
+    """
+    Scalar-only core of `compute_bbb_probability`.
+
+    numba cannot take the dataclass, so the inputs arrive as plain floats plus
+    the `BBBInputParams.weights` array (in `_SCORE_KEYS` order). Returns the
+    eight clipped factor scores in that order, then Z.
+    """
+    # factor scores (0–1); the transfer functions clamp their own output
+    size_score = size_transfer_function_fast(size_nm)
+    affinity_score = max(0.0, min(1.0, apoe3_affinity))
+    lipophilicity_score = lipophilicity_transfer_function_fast(logP)
+    charge_score = charge_transfer_function_fast(zeta_mV)
+    integrity_score = integrity_transfer_function(bbb_tightness)
+    inflammation_score = inflammation_transfer_function(inflammation)
+    dose_score = dose_transfer_function_fast(dose_relative)
+    carrier_score = max(0.0, min(1.0, apoe3_expression))
+
+    scores = (
+        size_score,
+        affinity_score,
+        lipophilicity_score,
+        charge_score,
+        integrity_score,
+        inflammation_score,
+        dose_score,
+        carrier_score,
+    )
+
+    # weighted sum for logistic, with a global offset to keep probabilities
+    # modest by default
+    Z = -2.0
+    for i in range(8):
+        Z += float(weights[i]) * scores[i]
+
+    return scores + (Z,)
+
+
 def compute_bbb_probability(params: BBBInputParams) -> Tuple[float, Dict[str, float]]:
+    *scores, Z = _compute_bbb_probability_nb(
+        params.size_nm,
+        params.apoe3_affinity,
+        params.logP,
+        params.zeta_mV,
+        params.dose_relative,
+        params.apoe3_expression,
+        params.bbb_tightness,
+        params.inflammation,
+        params.weights,
+    )
+
+    # Not memoized: the app already caches whole results per parameter set,
+    # and an lru_cache lookup costs more than this compiled call.
+    prob = logistic_fast(Z)
+
+    components = dict(zip(_SCORE_KEYS, scores))
+    components["Z"] = Z
+
+    return prob, components
+
+
+def compute_bbb_probability_batch(
+    size_nm,
+    apoe3_affinity,
+    logP,
+    zeta_mV,
+    dose_relative,
+    apoe3_expression,
+    bbb_tightness,
+    inflammation,
+    w_size,
+    w_aff,
+    w_lip,
+    w_charge,
+    w_int,
+    w_inf,
+    w_dose,
+    w_carrier,
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Vectorized `compute_bbb_probability` for parameter sweeps.
+
+    Every argument (same names as the `BBBInputParams` fields) may be a scalar
+    or an array; they are broadcast against each other, e.g. a size × logP
+    grid via `size_nm[:, None]` and `logP[None, :]`.
+    """
     # factor scores (0–1)
-    size_score = size_transfer_function(params.size_nm)
-    affinity_score = max(0.0, min(1.0, params.apoe3_affinity))
-    lipophilicity_score = lipophilicity_transfer_function(params.logP)
-    charge_score = charge_transfer_function(params.zeta_mV)
-    integrity_score = integrity_transfer_function(params.bbb_tightness)
-    inflammation_score = inflammation_transfer_function(params.inflammation)
-    dose_score = dose_transfer_function(params.dose_relative)
-    carrier_score = max(0.0, min(1.0, params.apoe3_expression))
+    size_score = size_transfer_vec(size_nm)
+    affinity_score = np.clip(apoe3_affinity, 0.0, 1.0)
+    lipophilicity_score = lipophilicity_transfer_vec(logP)
+    charge_score = charge_transfer_vec(zeta_mV)
+    integrity_score = integrity_transfer_vec(bbb_tightness)
+    inflammation_score = inflammation_transfer_vec(inflammation)
+    dose_score = dose_transfer_vec(dose_relative)
+    carrier_score = np.clip(apoe3_expression, 0.0, 1.0)
 
     # weighted sum for logistic
     Z = (
-        params.w_size * size_score
-        + params.w_aff * affinity_score
-        + params.w_lip * lipophilicity_score
-        + params.w_charge * charge_score
-        + params.w_int * integrity_score
-        + params.w_inf * inflammation_score
-        + params.w_dose * dose_score
-        + params.w_carrier * carrier_score
+        w_size * size_score
+        + w_aff * affinity_score
+        + w_lip * lipophilicity_score
+        + w_charge * charge_score
+        + w_int * integrity_score
+        + w_inf * inflammation_score
+        + w_dose * dose_score
+        + w_carrier * carrier_score
         - 2.0  # global offset to keep probabilities modest by default
     )
 
-    prob = logistic(Z)
+    prob = logistic_vec(Z)
 
+    # every component comes back with the full (broadcast) shape of `prob`
+    shape = np.shape(Z)
     components = {
-        "size_score": size_score,
-        "affinity_score": affinity_score,
-        "lipophilicity_score": lipophilicity_score,
-        "charge_score": charge_score,
-        "integrity_score": integrity_score,
-        "inflammation_score": inflammation_score,
-        "dose_score": dose_score,
-        "carrier_score": carrier_score,
+        "size_score": np.broadcast_to(size_score, shape),
+        "affinity_score": np.broadcast_to(affinity_score, shape),
+        "lipophilicity_score": np.broadcast_to(lipophilicity_score, shape),
+        "charge_score": np.broadcast_to(charge_score, shape),
+        "integrity_score": np.broadcast_to(integrity_score, shape),
+        "inflammation_score": np.broadcast_to(inflammation_score, shape),
+        "dose_score": np.broadcast_to(dose_score, shape),
+        "carrier_score": np.broadcast_to(carrier_score, shape),
         "Z": Z,
     }
 